@@ -1,8 +1,10 @@
 # SPDX-FileCopyrightText: 2022-2024 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 
+import collections
 import copy
 import functools
+import io
 import json
 import logging
 import os
@@ -80,6 +82,68 @@ class _AppBuildStageFilter(logging.Filter):
         return True
 
 
+# `%VAR%` is expanded by os.path.expandvars as well on Windows
+_ENV_VAR_CHARS = ('$', '%') if os.name == 'nt' else ('$',)
+
+
+def _has_env_vars(s: str) -> bool:
+    """
+    Cheap check before calling os.path.expandvars, which returns the string as is when there's no variable in it.
+    """
+    return any(c in s for c in _ENV_VAR_CHARS)
+
+
+_INLINE_FLAGS = ((re.ASCII, 'a'), (re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+# global inline flags like "(?i)", which can't be scoped to the sub-pattern
+_GLOBAL_INLINE_FLAGS_REGEX = re.compile(r'\(\?[aiLmsux]+\)')
+
+
+def _scoped_pattern(regex: t.Pattern) -> str:
+    """
+    Pattern of the regex with its flags scoped to itself, so that it could be embedded into another regex.
+    """
+    flags = ''.join(c for flag, c in _INLINE_FLAGS if regex.flags & flag)
+    if 'x' in flags:
+        # a comment at the end of a verbose pattern would comment out the closing parenthesis
+        return f'(?{flags}:{regex.pattern}\n)'
+
+    return f'(?{flags}:{regex.pattern})'
+
+
+@functools.lru_cache(maxsize=None)
+def _error_warning_regex(
+    error_warning_regex: t.Pattern,
+    ignore_regexes: t.Tuple[t.Union[str, t.Pattern], ...],
+) -> t.Optional[t.Pattern]:
+    """
+    Combine the regexes into one, which tells in a single match if a line is an error or warning,
+    and if it's ignored. The group "ignored" participates in the match only when any of the ignore regexes matches.
+
+    Regexes with capturing groups can't be combined safely since the groups would be renumbered, return None.
+    So do regexes with global inline flags, which would apply to the whole combined regex before Python 3.11.
+    """
+    regexes = [re.compile(error_warning_regex), *(re.compile(r) for r in ignore_regexes)]
+    if any(
+        r.groups
+        or r.flags & re.LOCALE
+        or not isinstance(r.pattern, str)
+        or _GLOBAL_INLINE_FLAGS_REGEX.search(r.pattern)
+        for r in regexes
+    ):
+        return None
+
+    # lookaheads from the beginning of the line, equivalent to search the regexes one by one
+    pattern = f'(?=(?s:.*?){_scoped_pattern(regexes[0])})'
+    if ignore_regexes:
+        ignored = '|'.join(_scoped_pattern(r) for r in regexes[1:])
+        pattern += f'(?:(?=(?s:.*?)(?:{ignored}))(?P<ignored>))?'
+
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return None
+
+
 class App(BaseModel):
     TARGET_PLACEHOLDER: t.ClassVar[str] = '@t'  # replace it with self.target
     WILDCARD_PLACEHOLDER: t.ClassVar[str] = '@w'  # replace it with the wildcard, usually the sdkconfig
@@ -87,6 +151,23 @@ class App(BaseModel):
     FULL_NAME_PLACEHOLDER: t.ClassVar[str] = '@f'  # replace it with escaped self.app_dir
     IDF_VERSION_PLACEHOLDER: t.ClassVar[str] = '@v'  # replace it with the IDF version
     INDEX_PLACEHOLDER: t.ClassVar[str] = '@i'  # replace it with the build index (while build_apps)
+    # matches the placeholders above, and the parallel index placeholder of BuildAppsArgs, to replace them in one scan.
+    # WILDCARD_PLACEHOLDER is excluded since it may remove the delimiter on its left as well
+    PLACEHOLDER_REGEX: t.ClassVar[t.Pattern] = re.compile(r'@[tnfvip]')
+    # the placeholder values, the cached paths, and the hash need to be re-calculated when these attributes change
+    _PATH_DEPENDENT_ATTRS: t.ClassVar[t.FrozenSet[str]] = frozenset([
+        'app_dir',
+        'target',
+        'sdkconfig_path',
+        'config_name',
+        'index',
+        'build_apps_args',
+        '_work_dir',
+        '_build_dir',
+        '_build_log_filename',
+        '_size_json_filename',
+        '_sdkconfig_files',
+    ])
 
     SDKCONFIG_LINE_REGEX: t.ClassVar[t.Pattern] = re.compile(r'^([^=]+)=\"?([^\"\n]*)\"?\n*$')
 
@@ -119,6 +200,12 @@ class App(BaseModel):
     _build_log_filename: t.Optional[str] = None
     _size_json_filename: t.Optional[str] = None
 
+    # placeholder -> value, calculated lazily
+    _placeholders: t.Optional[t.Dict[str, str]] = None
+    # property name -> value, for the properties that are expensive to calculate
+    _paths_cache: t.Dict[str, t.Any] = {}
+    _hash: t.Optional[int] = None
+
     dry_run: bool = False
     verbose: bool = False
     check_warnings: bool = False
@@ -136,10 +223,6 @@ class App(BaseModel):
     _build_duration: float = 0
     _build_timestamp: t.Optional[datetime] = None
 
-    __EQ_IGNORE_FIELDS__ = [
-        'build_comment',
-    ]
-
     def __init__(
         self,
         app_dir: str,
@@ -184,6 +267,72 @@ class App(BaseModel):
 
         self._sdkconfig_files, self._sdkconfig_files_defined_target = self._process_sdkconfig_files()
 
+    def __setattr__(self, name: str, value: t.Any) -> None:
+        super().__setattr__(name, value)
+
+        if name in self._PATH_DEPENDENT_ATTRS:
+            self._invalidate_paths()
+
+    def _invalidate_paths(self) -> None:
+        self._placeholders = None
+        self._paths_cache = {}
+        self._hash = None
+
+    # `model_copy` updates the copy via `__dict__` directly, bypassing `__setattr__`,
+    # and the private attrs are copied shallowly. Don't share the caches with the copy.
+    def __copy__(self):
+        new_app = super().__copy__()
+        new_app._invalidate_paths()
+        return new_app
+
+    def __deepcopy__(self, memo: t.Optional[t.Dict[int, t.Any]] = None):
+        new_app = super().__deepcopy__(memo)
+        new_app._invalidate_paths()
+        return new_app
+
+    def __hash__(self) -> int:
+        # only the attributes that identify the app, the build status related ones may change during the build.
+        # normalized the same way as in `_sort_key`, since equal apps must have the same hash
+        if self._hash is None:
+            self._hash = hash((
+                self.build_system,
+                self.app_dir,
+                self.target,
+                self.sdkconfig_path or '',
+                self.config_name or '',
+                self.index or 0,
+            ))
+
+        return self._hash
+
+    def _sort_key(self) -> t.Tuple[t.Any, ...]:
+        # the attributes that tell apps apart, used for both sorting and equality
+        return (
+            self.build_system,
+            self.app_dir,
+            self.target,
+            self.sdkconfig_path or '',
+            self.config_name or '',
+            self.sdkconfig_defaults_str or '',
+            self.index or 0,
+            self.work_dir,
+            self.build_dir,
+            self.build_log_filename or '',
+            self.size_json_filename or '',
+        )
+
+    def __lt__(self, other: t.Any) -> bool:
+        if isinstance(other, self.__class__):
+            return self._sort_key() < other._sort_key()
+
+        return NotImplemented
+
+    def __eq__(self, other: t.Any) -> bool:
+        if isinstance(other, self.__class__):
+            return self._sort_key() == other._sort_key()
+
+        return NotImplemented
+
     @classmethod
     def from_another(cls, other: 'App', **kwargs) -> 'App':
         """Init New App from another, with different parameters.
@@ -248,39 +397,67 @@ class App(BaseModel):
         if not path:
             return path
 
-        if self.index is not None:
-            path = path.replace(self.INDEX_PLACEHOLDER, str(self.index))
-        if self.build_apps_args:
-            path = self.build_apps_args.expand(path)
-        path = path.replace(
-            self.IDF_VERSION_PLACEHOLDER, f'{IDF_VERSION_MAJOR}_{IDF_VERSION_MINOR}_{IDF_VERSION_PATCH}'
-        )
-        path = path.replace(self.TARGET_PLACEHOLDER, self.target)
-        path = path.replace(self.NAME_PLACEHOLDER, self.name)
-        if self.FULL_NAME_PLACEHOLDER in path:  # to avoid recursion to the call to app_dir in the next line:
-            path = path.replace(self.FULL_NAME_PLACEHOLDER, self.app_dir.replace(os.path.sep, '_'))
-        wildcard_pos = path.find(self.WILDCARD_PLACEHOLDER)
-        if wildcard_pos != -1:
-            if self.config_name:
-                # if config name is defined, put it in place of the placeholder
-                path = path.replace(self.WILDCARD_PLACEHOLDER, self.config_name)
-            else:
-                # otherwise, remove the placeholder and one character on the left
-                # (which is usually an underscore, dash, or other delimiter)
-                left_of_wildcard = max(0, wildcard_pos - 1)
-                right_of_wildcard = wildcard_pos + len(self.WILDCARD_PLACEHOLDER)
-                path = path[0:left_of_wildcard] + path[right_of_wildcard:]
-        path = os.path.expandvars(path)
+        # most paths don't have any placeholder, skip the regex scan for them
+        if '@' in path:
+            placeholders = self._placeholder_values()
+            path = self.PLACEHOLDER_REGEX.sub(lambda m: placeholders.get(m.group(), m.group()), path)
+
+            wildcard_pos = path.find(self.WILDCARD_PLACEHOLDER)
+            if wildcard_pos != -1:
+                if self.config_name:
+                    # if config name is defined, put it in place of the placeholder
+                    path = path.replace(self.WILDCARD_PLACEHOLDER, self.config_name)
+                else:
+                    # otherwise, remove the placeholder and one character on the left
+                    # (which is usually an underscore, dash, or other delimiter)
+                    left_of_wildcard = max(0, wildcard_pos - 1)
+                    right_of_wildcard = wildcard_pos + len(self.WILDCARD_PLACEHOLDER)
+                    path = path[0:left_of_wildcard] + path[right_of_wildcard:]
+
+        if _has_env_vars(path):
+            path = os.path.expandvars(path)
+
         return path
 
+    def _placeholder_values(self) -> t.Dict[str, str]:
+        if self._placeholders is None:
+            placeholders = {
+                self.IDF_VERSION_PLACEHOLDER: f'{IDF_VERSION_MAJOR}_{IDF_VERSION_MINOR}_{IDF_VERSION_PATCH}',
+                self.TARGET_PLACEHOLDER: self.target,
+                self.NAME_PLACEHOLDER: self.name,
+                self.FULL_NAME_PLACEHOLDER: self.app_dir.replace(os.path.sep, '_'),
+            }
+            # keep the placeholders as is when not building with build_apps
+            if self.index is not None:
+                placeholders[self.INDEX_PLACEHOLDER] = str(self.index)
+            if self.build_apps_args:
+                placeholders[BuildAppsArgs.PARALLEL_INDEX_PLACEHOLDER] = str(self.build_apps_args.parallel_index)
+
+            self._placeholders = placeholders
+
+        return self._placeholders
+
+    def _expand_cached(self, name: str) -> t.Optional[str]:
+        """
+        Internal method, expands the private attr `name` and caches the result until the paths are invalidated.
+        """
+        if name not in self._paths_cache:
+            self._paths_cache[name] = self._expand(getattr(self, name))
+
+        return self._paths_cache[name]
+
     @property
     def name(self) -> str:
-        base_name = os.path.basename(self.app_dir)
-        # '.' for relative path like '.'
-        # '' for path endswith '/'
-        if base_name in ['.', '']:
-            return os.path.basename(os.path.abspath(self.app_dir))
-        return base_name
+        if 'name' not in self._paths_cache:
+            # normpath removes the trailing '/', without touching the file system
+            base_name = os.path.basename(os.path.normpath(self.app_dir))
+            # '.' for relative path like '.'
+            # '' for the root directory
+            if base_name in ['.', '']:
+                base_name = os.path.basename(os.path.abspath(self.app_dir))
+            self._paths_cache['name'] = base_name
+
+        return self._paths_cache['name']
 
     @computed_field  # type: ignore
     @property
@@ -288,7 +465,7 @@ class App(BaseModel):
         """
         :return: directory where the app should be copied to, prior to the build.
         """
-        return self._expand(self._work_dir)  # type: ignore
+        return self._expand_cached('_work_dir')  # type: ignore
 
     @computed_field  # type: ignore
     @property
@@ -296,27 +473,33 @@ class App(BaseModel):
         """
         :return: build directory, either relative to the work directory (if relative path is used) or absolute path.
         """
-        return self._expand(self._build_dir)  # type: ignore
+        return self._expand_cached('_build_dir')  # type: ignore
 
     @property
     def build_path(self) -> str:
-        if os.path.isabs(self.build_dir):
-            return self.build_dir
+        if 'build_path' not in self._paths_cache:
+            if os.path.isabs(self.build_dir):
+                self._paths_cache['build_path'] = self.build_dir
+            else:
+                self._paths_cache['build_path'] = os.path.join(self.work_dir, self.build_dir)
 
-        return os.path.join(self.work_dir, self.build_dir)
+        return self._paths_cache['build_path']
 
     @computed_field  # type: ignore
     @property
     def build_log_filename(self) -> t.Optional[str]:
-        return self._expand(self._build_log_filename)
+        return self._expand_cached('_build_log_filename')
 
     @property
     def build_log_path(self) -> str:
-        if self.build_log_filename:
-            return os.path.join(self.build_path, self.build_log_filename)
+        if 'build_log_path' not in self._paths_cache:
+            if self.build_log_filename:
+                self._paths_cache['build_log_path'] = os.path.join(self.build_path, self.build_log_filename)
+            else:
+                # use a temp file if build log path is not specified
+                self._paths_cache['build_log_path'] = os.path.join(self.build_path, f'.temp.build.{hash(self)}.log')
 
-        # use a temp file if build log path is not specified
-        return os.path.join(self.build_path, f'.temp.build.{hash(self)}.log')
+        return self._paths_cache['build_log_path']
 
     @computed_field  # type: ignore
     @property
@@ -325,14 +508,17 @@ class App(BaseModel):
             # esp-idf-size does not support linux target
             return None
 
-        return self._expand(self._size_json_filename)
+        return self._expand_cached('_size_json_filename')
 
     @property
     def size_json_path(self) -> t.Optional[str]:
-        if self.size_json_filename:
-            return os.path.join(self.build_path, self.size_json_filename)
+        if 'size_json_path' not in self._paths_cache:
+            if self.size_json_filename:
+                self._paths_cache['size_json_path'] = os.path.join(self.build_path, self.size_json_filename)
+            else:
+                self._paths_cache['size_json_path'] = None
 
-        return None
+        return self._paths_cache['size_json_path']
 
     def _process_sdkconfig_files(self) -> t.Tuple[t.List[str], t.Optional[str]]:
         """
@@ -342,10 +528,17 @@ class App(BaseModel):
         sdkconfig_files_defined_target: t.Optional[str] = None
 
         # put the expanded variable files in a temporary directory
-        # will remove if the content is the same as the original one
+        # only when the content is different from the original one
         expanded_dir = os.path.join(self.work_dir, 'expanded_sdkconfig_files', os.path.basename(self.build_dir))
-        if not os.path.isdir(expanded_dir):
-            os.makedirs(expanded_dir)
+        target_prefix = 'CONFIG_IDF_TARGET='
+        # lines with these keys are removed from the expanded files
+        removed_prefixes = (
+            tuple(f'{key}=' for key in self.SDKCONFIG_TEST_OPTS + self.SDKCONFIG_IGNORE_OPTS)
+            if isinstance(self, CMakeApp)
+            else ()
+        )
+        # only lines with these keys need to be parsed
+        parsed_prefixes = (target_prefix, *removed_prefixes)
 
         for f in self.sdkconfig_defaults_candidates + ([self.sdkconfig_path] if self.sdkconfig_path else []):
             # use filepath if abs/rel already point to itself
@@ -357,61 +550,64 @@ class App(BaseModel):
                     self._logger.debug('sdkconfig file %s not found, skipping...', f)
                     continue
 
-            expanded_fp = os.path.join(expanded_dir, os.path.basename(f))
             with open(f) as fr:
-                with open(expanded_fp, 'w') as fw:
-                    for line in fr:
-                        line = os.path.expandvars(line)
-
-                        m = self.SDKCONFIG_LINE_REGEX.match(line)
-                        if m:
-                            key = m.group(1)
-                            if key == 'CONFIG_IDF_TARGET':
+                content = fr.read()
+
+            # nothing to expand or to remove, use the file as is
+            if not _has_env_vars(content) and not any(prefix in content for prefix in removed_prefixes):
+                if target_prefix in content:
+                    for line in content.split('\n'):
+                        if line.startswith(target_prefix):
+                            m = self.SDKCONFIG_LINE_REGEX.match(line)
+                            if m:
                                 sdkconfig_files_defined_target = m.group(2)
 
-                            if isinstance(self, CMakeApp):
-                                if key in self.SDKCONFIG_TEST_OPTS:
-                                    self.cmake_vars[key] = m.group(2)
-                                    continue
+                self._logger.debug('Use sdkconfig file %s', f)
+                real_sdkconfig_files.append(f)
+                continue
 
-                                if key in self.SDKCONFIG_IGNORE_OPTS:
-                                    continue
+            expanded_lines = []
+            # split the lines only on '\n', like iterating over the file does
+            for line in io.StringIO(content):
+                if _has_env_vars(line):
+                    line = os.path.expandvars(line)
 
-                        fw.write(line)
+                m = self.SDKCONFIG_LINE_REGEX.match(line) if line.startswith(parsed_prefixes) else None
+                if not m:
+                    expanded_lines.append(line)
+                    continue
 
-            with open(f) as fr:
-                with open(expanded_fp) as new_fr:
-                    if fr.read() == new_fr.read():
-                        self._logger.debug('Use sdkconfig file %s', f)
-                        try:
-                            os.unlink(expanded_fp)
-                        except OSError:
-                            self._logger.debug('Failed to remove file %s', expanded_fp)
-                        real_sdkconfig_files.append(f)
-                    else:
-                        self._logger.debug('Expand sdkconfig file %s to %s', f, expanded_fp)
-                        real_sdkconfig_files.append(expanded_fp)
-                        # copy the related target-specific sdkconfig files
-                        par_dir = os.path.abspath(os.path.join(f, '..'))
-                        for target_specific_file in (
-                            os.path.join(par_dir, str(p))
-                            for p in Path(par_dir).glob(os.path.basename(f) + f'.{self.target}')
-                        ):
-                            self._logger.debug(
-                                'Copy target-specific sdkconfig file %s to %s', target_specific_file, expanded_dir
-                            )
-                            shutil.copy(target_specific_file, expanded_dir)
-
-        # remove if expanded folder is empty
-        try:
-            os.rmdir(expanded_dir)
-        except OSError:
-            pass
+                key, value = m.group(1), m.group(2)
+                if key == 'CONFIG_IDF_TARGET':
+                    sdkconfig_files_defined_target = value
+                elif isinstance(self, CMakeApp):
+                    if key in self.SDKCONFIG_TEST_OPTS:
+                        self.cmake_vars[key] = value
+                    # both SDKCONFIG_TEST_OPTS and SDKCONFIG_IGNORE_OPTS are removed
+                    continue
 
-        try:
-            os.rmdir(os.path.join(self.work_dir, 'expanded_sdkconfig_files'))
-        except OSError:
-            pass
+                expanded_lines.append(line)
+
+            expanded_content = ''.join(expanded_lines)
+            if expanded_content == content:
+                self._logger.debug('Use sdkconfig file %s', f)
+                real_sdkconfig_files.append(f)
+                continue
+
+            expanded_fp = os.path.join(expanded_dir, os.path.basename(f))
+            os.makedirs(expanded_dir, exist_ok=True)
+            with open(expanded_fp, 'w') as fw:
+                fw.write(expanded_content)
+
+            self._logger.debug('Expand sdkconfig file %s to %s', f, expanded_fp)
+            real_sdkconfig_files.append(expanded_fp)
+            # copy the related target-specific sdkconfig files
+            par_dir = os.path.abspath(os.path.join(f, '..'))
+            for target_specific_file in (
+                os.path.join(par_dir, str(p)) for p in Path(par_dir).glob(os.path.basename(f) + f'.{self.target}')
+            ):
+                self._logger.debug('Copy target-specific sdkconfig file %s to %s', target_specific_file, expanded_dir)
+                shutil.copy(target_specific_file, expanded_dir)
 
         if SESSION_ARGS.override_sdkconfig_file_path:
             real_sdkconfig_files.append(SESSION_ARGS.override_sdkconfig_file_path)
@@ -426,7 +622,10 @@ class App(BaseModel):
 
     @property
     def sdkconfig_files(self) -> t.List[str]:
-        return [os.path.abspath(file) for file in self._sdkconfig_files]
+        if 'sdkconfig_files' not in self._paths_cache:
+            self._paths_cache['sdkconfig_files'] = [os.path.abspath(file) for file in self._sdkconfig_files]
+
+        return self._paths_cache['sdkconfig_files']
 
     @property
     def depends_components(self) -> t.List[str]:
@@ -504,7 +703,9 @@ class App(BaseModel):
                     'sdkconfig',
                 )
 
-                shutil.copytree(self.app_dir, self.work_dir, ignore=ignore, symlinks=True)
+                # the timestamps and extended attributes are not needed for a fresh build,
+                # skip copying them to save a few syscalls per file
+                shutil.copytree(self.app_dir, self.work_dir, ignore=ignore, symlinks=True, copy_function=shutil.copy)
 
         if os.path.exists(self.build_path):
             self._logger.debug('Removed existing build dir: %s', self.build_path)
@@ -564,9 +765,15 @@ class App(BaseModel):
             return
 
         has_unignored_warning = False
+        # only the last few lines are kept, for debugging failed builds
+        last_lines: t.Deque[str] = collections.deque(maxlen=self.LOG_DEBUG_LINES)
         with open(self.build_log_path) as fr:
-            lines = [line.rstrip() for line in fr.readlines() if line.rstrip()]
-            for line in lines:
+            for line in fr:
+                line = line.rstrip()
+                if not line:
+                    continue
+
+                last_lines.append(line)
                 is_error_or_warning, ignored = self.is_error_or_warning(line)
                 if is_error_or_warning:
                     if ignored:
@@ -582,7 +789,7 @@ class App(BaseModel):
                 self.LOG_DEBUG_LINES,
                 self.build_log_path,
             )
-            for line in lines[-self.LOG_DEBUG_LINES :]:
+            for line in last_lines:
                 self._logger.error('%s', line)
 
         if self._is_build_log_path_temp and self.build_status == BuildStatus.SUCCESS:
@@ -675,6 +882,14 @@ class App(BaseModel):
         return self.model_dump_json()
 
     def is_error_or_warning(self, line: str) -> t.Tuple[bool, bool]:
+        regex = _error_warning_regex(self.LOG_ERROR_WARNING_REGEX, tuple(self.IGNORE_WARNS_REGEXES))
+        if regex:
+            m = regex.match(line)
+            if not m:
+                return False, False
+
+            return True, m.groupdict().get('ignored') is not None
+
         if not self.LOG_ERROR_WARNING_REGEX.search(line):
             return False, False
 
@@ -724,15 +939,19 @@ class App(BaseModel):
             self._checked_should_build = True
             return
 
+        # look up the manifest only once
+        depends_components = self.depends_components
+        depends_filepatterns = self.depends_filepatterns
+
         # if didn't modify any components, and no `depends_filepatterns` defined, skip
-        if modified_components == [] and not self.depends_filepatterns:
+        if modified_components == [] and not depends_filepatterns:
             self.build_status = BuildStatus.SKIPPED
             self.build_comment = 'current build does not modify any components'
             self._checked_should_build = True
             return
 
         # if no special rules defined, we left it unknown and decide with idf.py reconfigure
-        if not self.depends_components and not self.depends_filepatterns:
+        if not depends_components and not depends_filepatterns:
             # keep unknown
             self._checked_should_build = True
             self.build_comment = 'no special rules defined, run idf.py reconfigure to decide'
@@ -743,23 +962,23 @@ class App(BaseModel):
         modified_files = to_list(modified_files)
 
         # depends components?
-        if self.depends_components and modified_components is not None:
-            if set(self.depends_components).intersection(set(modified_components)):
+        if depends_components and modified_components is not None:
+            if not set(depends_components).isdisjoint(modified_components):
                 self._checked_should_build = True
                 self.build_status = BuildStatus.SHOULD_BE_BUILT
                 self.build_comment = (
-                    f'Requires components: {", ".join(self.depends_components)}. '
+                    f'Requires components: {", ".join(depends_components)}. '
                     f'Modified components: {", ".join(modified_components)}'
                 )
                 return
 
         # or depends file patterns?
-        if self.depends_filepatterns and modified_files is not None:
-            if files_matches_patterns(modified_files, self.depends_filepatterns, manifest_rootpath):
+        if depends_filepatterns and modified_files is not None:
+            if files_matches_patterns(modified_files, depends_filepatterns, manifest_rootpath):
                 self._checked_should_build = True
                 self.build_status = BuildStatus.SHOULD_BE_BUILT
                 self.build_comment = (
-                    f'Requires file patterns: {", ".join(self.depends_filepatterns)}. '
+                    f'Requires file patterns: {", ".join(depends_filepatterns)}. '
                     f'Modified files: {", ".join(modified_files)}'
                 )
                 return
@@ -773,6 +992,13 @@ class App(BaseModel):
 class MakeApp(App):
     MAKE_PROJECT_LINE: t.ClassVar[str] = r'include $(IDF_PATH)/make/project.mk'
 
+    MAKE_BUILD_COMMANDS: t.ClassVar[t.List[t.List[str]]] = [
+        # generate sdkconfig
+        ['make', 'defconfig'],
+        # build
+        ['make', f'-j{os.cpu_count() or 1}'],
+    ]
+
     build_system: Literal['make'] = 'make'  # type: ignore
 
     @property
@@ -808,14 +1034,7 @@ class MakeApp(App):
             'BUILD_DIR_BASE': self.build_path,
         }
 
-        commands = [
-            # generate sdkconfig
-            ['make', 'defconfig'],
-            # build
-            ['make', f'-j{os.cpu_count() or 1}'],
-        ]
-
-        for cmd in commands:
+        for cmd in self.MAKE_BUILD_COMMANDS:
             subprocess_run(
                 cmd,
                 log_terminal=self._is_build_log_path_temp,
@@ -917,7 +1136,7 @@ class CMakeApp(App):
             with open(os.path.join(self.build_path, PROJECT_DESCRIPTION_JSON)) as fr:
                 build_components = {item for item in json.load(fr)['build_components'] if item}
 
-            if not set(modified_components).intersection(set(build_components)):
+            if build_components.isdisjoint(modified_components):
                 self.build_status = BuildStatus.SKIPPED
                 self.build_comment = (
                     f'app {self.app_dir} depends components: {build_components}, '
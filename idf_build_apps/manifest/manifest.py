@@ -216,6 +216,9 @@ class Manifest:
     ) -> None:
         self.rules = sorted(rules, key=lambda x: x.folder)
 
+        # folder -> the most suitable rule, since apps under the same folder look it up many times
+        self._most_suitable_rules: t.Dict[str, FolderRule] = {}
+
     @classmethod
     def from_files(cls, paths: t.List[str]) -> 'Manifest':
         # folder, defined_at dict
@@ -268,11 +271,17 @@ class Manifest:
 
     def _most_suitable_rule(self, _folder: str) -> FolderRule:
         folder = os.path.abspath(_folder)
+        if folder in self._most_suitable_rules:
+            return self._most_suitable_rules[folder]
+
+        res: FolderRule = DefaultRule(folder)
         for rule in self.rules[::-1]:
             if os.path.commonpath([folder, rule.folder]) == rule.folder:
-                return rule
+                res = rule
+                break
 
-        return DefaultRule(folder)
+        self._most_suitable_rules[folder] = res
+        return res
 
     def enable_build_targets(
         self, folder: str, default_sdkconfig_target: t.Optional[str] = None, config_name: t.Optional[str] = None
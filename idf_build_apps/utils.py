@@ -10,9 +10,6 @@ import shutil
 import subprocess
 import sys
 import typing as t
-from copy import (
-    deepcopy,
-)
 
 from packaging.version import (
     Version,
@@ -154,7 +151,7 @@ def subprocess_run(
 
     subprocess_env = None
     if additional_env_dict is not None:
-        subprocess_env = deepcopy(os.environ)
+        subprocess_env = os.environ.copy()
         subprocess_env.update(additional_env_dict)
 
     p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=subprocess_env, **kwargs)
@@ -299,13 +296,12 @@ def files_matches_patterns(
 ) -> bool:
     # can't match an absolute pattern with a relative path
     # change all to absolute paths
-    matched_paths = set()
-    for pat in [to_absolute_path(p, rootpath) for p in to_list(patterns)]:
-        matched_paths.update(glob.glob(str(pat), recursive=True))
-
-    for f in [to_absolute_path(f, rootpath) for f in to_list(files)]:
-        if str(f) in matched_paths:
-            return True
+    abs_files = {to_absolute_path(f, rootpath) for f in to_list(files)}
+    for pat in to_list(patterns):
+        # return at the first match, no need to glob the rest
+        for matched_path in glob.iglob(to_absolute_path(pat, rootpath), recursive=True):
+            if matched_path in abs_files:
+                return True
 
     return False
 
@@ -1,6 +1,9 @@
 # SPDX-FileCopyrightText: 2023-2024 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 
+import ntpath
+import os
+import re
 import sys
 
 import pytest
@@ -13,6 +16,15 @@ from idf_build_apps import (
     CMakeApp,
     MakeApp,
 )
+from idf_build_apps.build_apps_args import (
+    BuildAppsArgs,
+)
+from idf_build_apps.constants import (
+    IDF_VERSION_MAJOR,
+    IDF_VERSION_MINOR,
+    IDF_VERSION_PATCH,
+    BuildStatus,
+)
 from idf_build_apps.main import (
     json_to_app,
 )
@@ -67,12 +79,37 @@ def test_app_sorting():
     assert a < c < d
     assert d > c > a
 
-    # __EQ_IGNORE_FIELDS__
+    # build status related attributes are not compared
     assert d == e
     assert not d < e
     assert not d > e
 
 
+def test_app_hash():
+    a = CMakeApp('foo', 'esp32')
+    b = CMakeApp('foo', 'esp32')
+    c = MakeApp('foo', 'esp32')
+
+    assert hash(a) == hash(b)
+    assert len({a, b, c}) == 2
+
+    # build status related attributes changes during the build
+    a_hash = hash(a)
+    a.build_status = BuildStatus.SUCCESS
+    a.build_comment = 'build_comment'
+    assert hash(a) == a_hash
+    assert a == b
+
+    a.index = 1
+    assert hash(a) != a_hash
+
+    # unset attributes are the same as the empty ones
+    apps = {b, c}
+    assert CMakeApp('foo', 'esp32', config_name='') in apps
+    assert CMakeApp('foo', 'esp32', sdkconfig_path='') in apps
+    assert CMakeApp('foo', 'esp32', index=0) in apps
+
+
 def test_app_deserializer():
     a = CMakeApp('foo', 'esp32')
     b = MakeApp('foo', 'esp32')
@@ -104,3 +141,129 @@ def test_app_init_from_another():
     assert b.target == 'esp32c3'
     assert 'build_esp32_' == a.build_dir
     assert 'build_esp32c3_' == b.build_dir
+
+
+def test_app_expand_placeholders(monkeypatch):
+    monkeypatch.setenv('FOO', 'foo')
+
+    a = CMakeApp(
+        'bar',
+        'esp32',
+        config_name='release',
+        work_dir='$FOO/@f_@n',
+        build_dir='build_@t_@w_@i',
+        build_log_filename='build_@v.log',
+    )
+    assert a.work_dir == 'foo/bar_bar'
+    assert a.build_dir == 'build_esp32_release_@i'
+    assert a.build_path == os.path.join('foo/bar_bar', 'build_esp32_release_@i')
+    assert a.build_log_filename == f'build_{IDF_VERSION_MAJOR}_{IDF_VERSION_MINOR}_{IDF_VERSION_PATCH}.log'
+
+    a.index = 3
+    a.target = 'esp32s2'
+    assert a.build_dir == 'build_esp32s2_release_3'
+    assert a.build_path == os.path.join('foo/bar_bar', 'build_esp32s2_release_3')
+
+    a.build_apps_args = BuildAppsArgs(parallel_index=2)
+    a._build_log_filename = 'build_@p_@i.log'
+    assert a.build_log_filename == 'build_2_3.log'
+
+    b = CMakeApp('bar', 'esp32', build_dir='build_@t_@w')
+    assert b.build_dir == 'build_esp32'
+
+
+def test_app_expandvars_windows(tmp_path, monkeypatch):
+    # `%VAR%` is expanded as well on Windows
+    monkeypatch.setattr('idf_build_apps.app._ENV_VAR_CHARS', ('$', '%'))
+    monkeypatch.setattr(os.path, 'expandvars', ntpath.expandvars)
+    monkeypatch.setenv('FOO', 'foo')
+
+    (tmp_path / 'sdkconfig.defaults').write_text('CONFIG_A="%FOO%"\n')
+    (tmp_path / 'sdkconfig.ci').write_text('CONFIG_B="%FOO%"\nCONFIG_C="$FOO"\n')
+
+    a = CMakeApp(str(tmp_path), 'esp32', sdkconfig_path=str(tmp_path / 'sdkconfig.ci'), build_dir='build_%FOO%')
+    assert a.build_dir == 'build_foo'
+
+    expanded_dir = tmp_path / 'expanded_sdkconfig_files' / 'build_foo'
+    assert a.sdkconfig_files == [str(expanded_dir / 'sdkconfig.defaults'), str(expanded_dir / 'sdkconfig.ci')]
+    assert (expanded_dir / 'sdkconfig.defaults').read_text() == 'CONFIG_A="foo"\n'
+    assert (expanded_dir / 'sdkconfig.ci').read_text() == 'CONFIG_B="foo"\nCONFIG_C="foo"\n'
+
+
+def test_app_process_sdkconfig_files(tmp_path, monkeypatch):
+    monkeypatch.setenv('FOO', 'foo')
+
+    (tmp_path / 'sdkconfig.defaults').write_text('CONFIG_A=y\nCONFIG_IDF_TARGET="esp32s2"\n')
+    (tmp_path / 'sdkconfig.ci.expand').write_text('CONFIG_B="$FOO"\nTEST_COMPONENTS="bar"\nTEST_GROUPS=baz\n')
+
+    a = CMakeApp(str(tmp_path), 'esp32s2', sdkconfig_path=str(tmp_path / 'sdkconfig.ci.expand'))
+    # used as is
+    assert a.sdkconfig_files[0] == str(tmp_path / 'sdkconfig.defaults')
+    assert a.sdkconfig_files_defined_idf_target == 'esp32s2'
+    # expanded
+    assert a.sdkconfig_files[1] == str(tmp_path / 'expanded_sdkconfig_files' / 'build' / 'sdkconfig.ci.expand')
+    assert (tmp_path / 'expanded_sdkconfig_files' / 'build' / 'sdkconfig.ci.expand').read_text() == 'CONFIG_B="foo"\n'
+    assert a.cmake_vars == {'TEST_COMPONENTS': 'bar'}
+
+    # lines not in the form of KEY=VALUE or KEY="VALUE" are not parsed
+    (tmp_path / 'sdkconfig.defaults').write_text('CONFIG_IDF_TARGET="esp32s2" \n')
+    (tmp_path / 'sdkconfig.ci.expand').write_text('TEST_COMPONENTS="bar" # note\n')
+
+    a = CMakeApp(str(tmp_path), 'esp32s2', sdkconfig_path=str(tmp_path / 'sdkconfig.ci.expand'))
+    assert a.sdkconfig_files == [str(tmp_path / 'sdkconfig.defaults'), str(tmp_path / 'sdkconfig.ci.expand')]
+    assert a.sdkconfig_files_defined_idf_target is None
+    assert a.cmake_vars == {}
+
+    # lines are split only on '\n'
+    (tmp_path / 'sdkconfig.ci.expand').write_text('CONFIG_A=1\x0cTEST_COMPONENTS=bar\n')
+
+    a = CMakeApp(str(tmp_path), 'esp32s2', sdkconfig_path=str(tmp_path / 'sdkconfig.ci.expand'))
+    assert a.sdkconfig_files[1] == str(tmp_path / 'sdkconfig.ci.expand')
+    assert a.cmake_vars == {}
+
+
+@pytest.mark.parametrize('deep', [False, True])
+def test_app_model_copy(deep):
+    a = CMakeApp('foo', 'esp32', build_dir='build_@t')
+    assert a.build_dir == 'build_esp32'
+    a_hash = hash(a)
+
+    b = a.model_copy(update={'target': 'esp32s2'}, deep=deep)
+    assert b.build_dir == 'build_esp32s2'
+    assert hash(b) != a_hash
+
+    # caches are not shared
+    assert a.build_dir == 'build_esp32'
+    assert hash(a) == a_hash
+
+
+@pytest.mark.parametrize(
+    'line, expected',
+    [
+        ('foo.c:1:1: warning: unused variable', (True, True)),
+        ('foo.c:1:1: WARNING: implicit declaration', (True, False)),
+        ('foo.c:1:1: warn\u0131ng: implicit declaration', (True, False)),
+        ('foo.c:1:1: error: deprecated, use bar instead', (True, True)),
+        ('foo.c:1:1: warning: DEPRECATED, use bar instead', (True, False)),
+        ('ld: error: undefined reference', (True, False)),
+        ('deprecated, unused variable', (False, False)),
+        ('warnings are not errors', (False, False)),
+        ('Project build complete.', (False, False)),
+    ],
+)
+@pytest.mark.parametrize(
+    'ignore_warns_regexes',
+    [
+        [re.compile(r'unused \w+'), 'deprecated'],
+        [re.compile(r'UNUSED \w+', re.IGNORECASE), re.compile(r'deprecated  # comment', re.VERBOSE)],
+        # regexes with groups are searched one by one
+        [re.compile(r'(unused) \w+'), 'deprecated'],
+        # regexes with global inline flags are searched one by one
+        [re.compile(r'(?i)unused \w+'), 'deprecated'],
+    ],
+)
+def test_app_is_error_or_warning(monkeypatch, ignore_warns_regexes, line, expected):
+    monkeypatch.setattr(CMakeApp, 'IGNORE_WARNS_REGEXES', ignore_warns_regexes)
+
+    a = CMakeApp('foo', 'esp32')
+    assert a.is_error_or_warning(line) == expected
@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: 2022-2023 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 import os
+import sys
 from pathlib import (
     Path,
 )
@@ -11,6 +12,7 @@ from idf_build_apps.utils import (
     files_matches_patterns,
     get_parallel_start_stop,
     rmdir,
+    subprocess_run,
     to_absolute_path,
 )
 
@@ -134,3 +136,14 @@ def test_files_matches_patterns(tmpdir):
         os.chdir(temp_dir)
         for f in matched_files:
             assert files_matches_patterns(f, abs_pat)
+
+
+def test_subprocess_run_additional_env_dict(tmp_path):
+    cmd = [sys.executable, '-c', 'import os; print(os.getenv("IDF_BUILD_APPS_TEST_ENV"))']
+
+    subprocess_run(cmd, log_fs=str(tmp_path / 'with.log'), additional_env_dict={'IDF_BUILD_APPS_TEST_ENV': 'foo'})
+    assert (tmp_path / 'with.log').read_text().strip() == 'foo'
+
+    # should not leak to the environment of the current process
+    subprocess_run(cmd, log_fs=str(tmp_path / 'without.log'))
+    assert (tmp_path / 'without.log').read_text().strip() == 'None'